@@ -10,9 +10,6 @@ from graphqlclient import GraphClient, ExitStatus
 if __name__ == "__main__":
 
     try:
-        client = GraphClient(
-            base_url="https://fruits-ai.netlify.app",
-            verbose=True)
         my_query = """query oneFruit {
           fruit(id: 5) {
             id
@@ -23,7 +20,10 @@ if __name__ == "__main__":
           }
         }
         """
-        print(client.query(my_query=my_query))
+        with GraphClient(
+                base_url="https://fruits-ai.netlify.app",
+                verbose=True) as client:
+            print(client.query(my_query=my_query))
     except Exception:
         sys.exit(ExitStatus.EX_KO)
 
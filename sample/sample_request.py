@@ -11,8 +11,6 @@ from graphqlclient import GraphClient, ExitStatus
 if __name__ == "__main__":
 
     try:
-        client = GraphClient(base_url="https://fruits-api.netlify.app",
-                             verbose=True)
         query = """query oneFruit {
           fruit(id: 5) {
             id
@@ -23,7 +21,9 @@ if __name__ == "__main__":
           }
         }
         """
-        print(json.dumps(client.query(my_query=query), indent=4))
+        with GraphClient(base_url="https://fruits-api.netlify.app",
+                         verbose=True) as client:
+            print(json.dumps(client.query(my_query=query), indent=4))
 
     except Exception:
         sys.exit(ExitStatus.EX_KO)
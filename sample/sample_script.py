@@ -4,7 +4,6 @@
 import argparse
 import sys
 import json
-from graphqlclient import GraphClient, ExitStatus
 
 
 def get_argparser() -> argparse.ArgumentParser:
@@ -28,23 +27,23 @@ def get_argparser() -> argparse.ArgumentParser:
 
 
 if __name__ == "__main__":
-    # manage args
+    # manage args (--help or a bad argument exit before the client import)
     args = get_argparser().parse_args()
+    from graphqlclient import GraphClient, ExitStatus
 
     try:
-        client: GraphClient = GraphClient(
-            json_keyfile=args.json_keyfile,
-            insecure=args.insecure,
-            verbose=args.verbose,
-            session="mysession",
-            graphql="mygraphql",
-            manage_token=False)
-
         query = """query XXXX
         XXXXX
         """
 
-        print(json.dumps(client.query(my_query=query), indent=4))
+        with GraphClient(
+                json_keyfile=args.json_keyfile,
+                insecure=args.insecure,
+                verbose=args.verbose,
+                session="mysession",
+                graphql="mygraphql",
+                manage_token=False) as client:
+            print(json.dumps(client.query(my_query=query), indent=4))
 
     except Exception:
         sys.exit(ExitStatus.EX_KO)
@@ -4,23 +4,33 @@
 """Python GraphQL Client."""
 from __future__ import annotations
 
-import datetime
-import http
 import json
 import logging
 import os
-import re
 import sys
+import tempfile
+import time
+from dataclasses import dataclass
 from enum import Enum, IntEnum, unique
-from functools import wraps
-from http.client import HTTPConnection
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Any, Callable, NamedTuple, Optional, TypeVar, cast
-
-import requests
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar, Union, cast
 
 from graphqlclient.__about__ import __version__
 
+try:
+    # optional dependency: faster JSON encoder/decoder
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if TYPE_CHECKING:
+    # requests/httpx are imported when the first client is created (startup
+    # time)
+    import httpx
+    import requests
+
 # Function type
 F = TypeVar('F', bound=Callable[..., Any])
 
@@ -48,6 +58,12 @@ class Constants(Enum):
 
     CHK_PYT_MIN: tuple[int, int, int] = (3, 7, 0)
     TIMEOUT: int = 30
+    POOL_MAXSIZE: int = 10
+    QUERY_CACHE_SIZE: int = 128
+    BATCH_UNSUPPORTED: tuple[int, ...] = (400, 404, 405, 415, 422)
+    RETRY_TOTAL: int = 3
+    RETRY_BACKOFF: float = 0.2
+    RETRY_STATUS: tuple[int, int, int] = (502, 503, 504)
     TOKEN_EXT: str = "token"
     TOKEN_LIFESPAN: int = 1     # 1: 1 Hour
     ENCODING: str = "UTF-8"
@@ -60,12 +76,14 @@ class Message(Enum):
     """Define messages."""
 
     LOG_FUNC: str = "%s(): %s"
+    LOG_ERR: str = "%s(): %s - raised: %s"
     KEYFILE_INFO: str = "Key file: %s"
     TOKEN_FOUND: str = "Token file: %s"
     TOKEN_GET: str = "Token: Use the current access token."
     TOKEN_DEL: str = "Token: Close your session."
     TOKEN_TIMESTAMP: str = "Current access token timestamp: %s"
     TOKEN_WRITE: str = "Token: Write the new access token."
+    TOKEN_SAME: str = "Token: The token file is up to date."
     TOKEN_RENEW: str = "Token: ** GET A NEW ACCESS TOKEN - REQUESTED. **"
     TOKEN_KEEP_OPT: str = "Token: ** KEEP THE CURRENT ACCESS TOKEN BY OPT. **"
     TOKEN_KEEP: str = "Token: Keep the current access token."
@@ -77,6 +95,45 @@ class Message(Enum):
     VERSION: str = "graphqlclient version: %s"
     PYT_VERSION: str = "Python environment: %s"
     CLOSE_SESSION_ERR: str = "close_session() is used but not applicable."
+    BATCH_FALLBACK: str = "Batch: HTTP %s, send the queries one by one."
+    CLIENT_CLOSED: str = "The client is closed: create a new GraphClient."
+
+
+# values read on each request/token check: bound once (no enum lookup)
+_TIMEOUT: int = Constants.TIMEOUT.value
+_ENCODING: str = Constants.ENCODING.value
+_TOKEN_LIFESPAN_SEC: int = Constants.TOKEN_LIFESPAN.value * 3600
+_MSG_LOG_FUNC: str = Message.LOG_FUNC.value
+# queries by batch: apollo BatchHttpLink default (batchMax). Out of
+# Constants because @unique rejects a second member valued 10.
+_MAX_BATCH: int = 10
+_BATCH_UNSUPPORTED: frozenset[int] = frozenset(
+    Constants.BATCH_UNSUPPORTED.value)
+
+# static headers shared by the sessions (requests and httpx copy them).
+# Accept-Encoding is left to requests/httpx: both already ask for a
+# compressed response and add br/zstd when the decoder is installed
+_STATIC_HEADERS: dict[str, str] = {'Content-Type': 'application/json',
+                                   'Accept': 'application/json'}
+
+
+def std_json_dumps(obj: Any) -> bytes:
+    """Serialize obj to a JSON document (bytes) with the standard library."""
+    return json.dumps(obj, separators=(',', ':')).encode(_ENCODING)
+
+
+# JSON encoder/decoder (bytes) chosen once: orjson is called directly,
+# without a wrapper function on each request
+json_dumps: Callable[[Any], bytes] = orjson.dumps if HAS_ORJSON \
+    else std_json_dumps
+json_loads: Callable[[bytes], Any] = orjson.loads if HAS_ORJSON \
+    else json.loads
+
+
+@lru_cache(maxsize=Constants.QUERY_CACHE_SIZE.value)
+def json_dumps_query(my_query: str) -> bytes:
+    """Serialize a query without variables (cached for repeated queries)."""
+    return json_dumps({"query": my_query})
 
 
 def http_patch_log(*args: Any) -> None:
@@ -86,10 +143,13 @@ def http_patch_log(*args: Any) -> None:
 
 def enable_logging() -> None:
     """Enable login to analyze the requests."""
+    # pylint: disable=import-outside-toplevel
+    import http.client
+
     # verbose traceback - type ignore for mypy
     sys.tracebacklimit = None  # type: ignore
     # enable debug
-    HTTPConnection.debuglevel = 1
+    http.client.HTTPConnection.debuglevel = 1
     # patch http.client.print - type ignore for mypy
     http.client.print = http_patch_log  # type: ignore
     # simple logging setup
@@ -105,34 +165,39 @@ def enable_logging() -> None:
 def check_exception(func: F) -> F:
     """Wrap the passed in function and logs exceptions.
 
-    We have 3 function with request therefore we want an homogeneous exception
-    management with this decorator.
+    The functions with request (token request/deletion, query, query_raw,
+    query_batch) use this decorator to get an homogeneous exception
+    management.
     """
+    # the name and the summary don't change: computed once by function
+    name = func.__name__
+    info = "" if func.__doc__ is None else func.__doc__.split("\n", 1)[0]
 
     @wraps(func)
     def func_wrapper(*args: Any, **kwargs: Any) -> Any:
         try:
-            # track func name and run it
-            info = "" if func.__doc__ is None else func.__doc__.split("\n")[0]
-            logger.debug(Message.LOG_FUNC.value, func.__name__, info)
+            # track func name (only if the debug mode is enabled) and run it
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(_MSG_LOG_FUNC, name, info)
             return func(*args, **kwargs)
-        # track all exceptions and finish with a generic "Exception"
-        except (requests.exceptions.HTTPError,
-                requests.exceptions.ConnectionError,
-                requests.exceptions.Timeout,
-                requests.exceptions.RequestException, Exception) as err:
-            msg = f"{func.__name__}(): {type(err).__name__} - raised: {err}"
-            logger.error(msg)
+        # track all exceptions: the requests exceptions (HTTPError,
+        # ConnectionError, Timeout...) are caught by the generic "Exception"
+        # therefore we don't need to import requests here
+        except Exception as err:
+            logger.error(Message.LOG_ERR.value, name, type(err).__name__, err)
             raise
     return cast(F, func_wrapper)
 
 
-class Files(NamedTuple):
+@dataclass(frozen=True)
+class Files:
     """Describe files.
 
     Note: @classmethod is used to init the objects correctly with the key_file.
     """
 
+    __slots__ = ('key', 'token')
+
     key: Path
     token: Path
 
@@ -149,13 +214,21 @@ class Files(NamedTuple):
 
         """
         key_file = Path(os.path.abspath(path))
-        token_file = Path(
-            f"{key_file.parent}/{key_file.stem}.{Constants.TOKEN_EXT.value}")
+        token_file = key_file.with_suffix(f".{Constants.TOKEN_EXT.value}")
         return cls(key=key_file, token=token_file)
 
 
-class Options(NamedTuple):
-    """Manage optional arguments."""
+@dataclass(frozen=True)
+class Options:  # pylint: disable=too-many-instance-attributes
+    """Manage optional arguments.
+
+    The options are read on each HTTP call therefore we use __slots__ (direct
+    slot access instead of the tuple index).
+    """
+
+    __slots__ = ('verify', 'proxies', 'session', 'graphql', 'manage_token',
+                 'keep_token', 'verbose', 'trust_env', 'http2',
+                 'pool_maxsize')
 
     verify: bool
     proxies: Optional[dict[str, str]]
@@ -164,14 +237,151 @@ class Options(NamedTuple):
     manage_token: bool
     keep_token: bool
     verbose: bool
+    trust_env: bool
+    http2: bool
+    pool_maxsize: int
+
+
+@dataclass(frozen=True)
+class Urls:
+    """Describe the urls.
+
+    The urls don't change for the client lifetime therefore we build them
+    once.
+    """
+
+    __slots__ = ('base', 'query', 'session')
+
+    base: str
+    query: str
+    session: str
+
+    @classmethod
+    def set_base_url(cls, base_url: str, options: Options) -> Urls:
+        """Define urls with the base url.
+
+        Args:
+            base_url: The base url.
+            options: The options (endpoints).
+        Returns:
+            Urls
+
+        """
+        return cls(base=base_url,
+                   query=f"{base_url}/{options.graphql}",
+                   session=f"{base_url}/{options.session}")
+
+
+@dataclass(frozen=True)
+class Auth:
+    """Describe the authentication request.
+
+    The key file is read once: we keep the url and the encoded payload to
+    renew the token.
+    """
+
+    __slots__ = ('uri', 'payload')
+
+    uri: str
+    payload: bytes
+
+    @classmethod
+    def set_json_key(cls, json_key: dict[str, str]) -> Auth:
+        """Define the authentication request with the json key.
+
+        Args:
+            json_key: The json key file content.
+        Returns:
+            Auth
+
+        """
+        return cls(uri=json_key['access_token_uri'],
+                   payload=json_dumps({
+                       "client_id": json_key['client_id'],
+                       "client_secret": json_key['client_secret'],
+                       "name": json_key['name']}))
+
+
+def new_session(options: Options) -> requests.Session:
+    """Create the HTTP session shared by all the requests.
+
+    The session keeps the connections alive (connection pool) therefore we
+    avoid a new TCP/TLS handshake for each request.
+
+    Args:
+        options(Options): client options (verify, proxies)
+    Returns:
+        requests.Session
+
+    """
+    # pylint: disable=import-outside-toplevel
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
+    session = requests.Session()
+    session.headers.update(_STATIC_HEADERS)
+    session.verify = options.verify
+    # trust_env=False: skip the environment lookups done by each request
+    # (proxies, proxy bypass, .netrc, CA bundle)
+    session.trust_env = options.trust_env
+    if options.proxies:
+        session.proxies.update(options.proxies)
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=options.pool_maxsize,
+        max_retries=Retry(
+            total=Constants.RETRY_TOTAL.value,
+            backoff_factor=Constants.RETRY_BACKOFF.value,
+            status_forcelist=Constants.RETRY_STATUS.value,
+            raise_on_status=False))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def new_http2_session(options: Options) -> httpx.Client:
+    """Create the HTTP/2 session shared by all the requests (httpx).
+
+    The concurrent requests (threads) are multiplexed on the same connection
+    instead of waiting for a free connection in the pool.
 
+    Args:
+        options(Options): client options (verify, proxies)
+    Returns:
+        httpx.Client
 
-class GraphClient:
+    """
+    # pylint: disable=import-outside-toplevel
+    import httpx
+
+    # the client limits are not applied to the mounted transports
+    limits = httpx.Limits(max_connections=options.pool_maxsize)
+    # one transport by proxy: requests uses {"https": url}, httpx mounts
+    # the transports with the "https://" pattern
+    mounts: Optional[dict[str, httpx.HTTPTransport]] = None
+    if options.proxies:
+        mounts = {
+            f"{scheme}://": httpx.HTTPTransport(
+                proxy=proxy, http2=True, verify=options.verify,
+                limits=limits)
+            for scheme, proxy in options.proxies.items()}
+    return httpx.Client(
+        http2=True,
+        verify=options.verify,
+        trust_env=options.trust_env,
+        mounts=mounts,
+        headers=_STATIC_HEADERS,
+        limits=limits,
+        timeout=Constants.TIMEOUT.value)
+
+
+class GraphClient:  # pylint: disable=too-many-instance-attributes
     """Define the GraphQL Client.
 
     Args:
         json_keyfile (str): /path/to/the/keyfile
-        **kwargs (Any):
+        keyword-only arguments:
             - insecure (bool): deactivate SSL check
             - proxies (Optional[dict[str, str]]): proxies
             - session (str): endpoint to manage session
@@ -185,142 +395,226 @@ class GraphClient:
                 Else, False by default (anonymous)
             - base_url (str): init the base url (anonymous mode)
             - verbose (bool): verbose mode
+            - trust_env (bool): use the environment settings (True by default)
+                If False, proxies/.netrc/CA bundle from the environment are
+                ignored and requests skips these lookups on each call.
+            - http2 (bool): use HTTP/2 with httpx (False by default)
+                The optional dependency httpx[http2] must be installed.
+            - pool_maxsize (int): connections kept in the pool (10 by default)
+                Increase it if the client is shared by more threads.
+
+    The client keeps one HTTP session (connection pool) for all the requests,
+    use close() or a with statement to release the connections.
 
     Examples:
         Anonymous connection to "https://fruits-api.netlify.app":
         >>> graphql_target = "https://spacex-production.up.railway.app/"
-        >>> client = GraphClient(base_url=graphql_target)
         >>> my_query = "query Exmpl {company {ceo}  roadster {apoapsis_au}}"
-        >>> client.query(my_query=my_query)
+        >>> with GraphClient(base_url=graphql_target) as client:
+        ...     client.query(my_query=my_query)
         {'data': {'company': {'ceo': 'Elon Musk'}, ...
 
     """
 
-    __base_url: str = ""
-    __json_key: dict[str, str] = {}
-    __token: str = ""
+    # no instance __dict__: the attributes are read on each request
+    __slots__ = ('__urls', '__auth', '__token', '__headers', '__files',
+                 '__options', '__session', '__closed')
+
+    __urls: Urls
+    __auth: Optional[Auth]
+    __token: str
+    __headers: dict[str, str]
     __files: Files
     __options: Options
-
-    def __init__(self, json_keyfile: Optional[str] = None, **kwargs: Any) \
-            -> None:
+    __session: Union[requests.Session, httpx.Client]
+    __closed: bool
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(self, json_keyfile: Optional[str] = None, *,
+                 insecure: bool = False,
+                 proxies: Optional[dict[str, str]] = None,
+                 session: str = 'session',
+                 graphql: str = 'graphql',
+                 manage_token: Optional[bool] = None,
+                 keep_token: Optional[bool] = None,
+                 base_url: str = "",
+                 verbose: bool = False,
+                 trust_env: bool = True,
+                 http2: bool = False,
+                 pool_maxsize: int = Constants.POOL_MAXSIZE.value) -> None:
         """Initialize."""
         self.__options = Options(
-            verify=not kwargs.get('insecure', False),
-            proxies=kwargs.get('proxies'),
-            session=kwargs.get('session', 'session'),
-            graphql=kwargs.get('graphql', 'graphql'),
-            manage_token=kwargs.get('manage_token', bool(json_keyfile)),
-            keep_token=kwargs.get('keep_token', bool(json_keyfile)),
-            verbose=kwargs.get('verbose', False))
+            verify=not insecure,
+            proxies=proxies,
+            session=session,
+            graphql=graphql,
+            manage_token=bool(json_keyfile) if manage_token is None
+            else manage_token,
+            keep_token=bool(json_keyfile) if keep_token is None
+            else keep_token,
+            verbose=verbose,
+            trust_env=trust_env,
+            http2=http2,
+            pool_maxsize=pool_maxsize)
+        self.__auth = None
+        self.__set_token("")
 
         if self.__options.verbose:
             enable_logging()
 
+        self.__session = new_http2_session(self.__options) \
+            if self.__options.http2 else new_session(self.__options)
+        self.__closed = False
+
         if json_keyfile:
             # Keyfile -> authentication & token management
             self.__files = Files.set_key_file(json_keyfile)
             self.__manage_session()
         else:
             # anonymous -> get base_url option
-            self.__base_url = kwargs.get('base_url', "")
+            self.__urls = Urls.set_base_url(base_url, self.__options)
 
-    @check_exception
     def __read_key_file(self) -> None:
         """Read Key File and update attributes."""
         # log the filename used
-        logger.info(Message.KEYFILE_INFO.value, self.__files.key)
-        # read the json key file
-        self.__json_key = json.loads(self.__files.key.read_text(
-            Constants.ENCODING.value))
-        # get base url
-        self.__base_url = re.sub(
-            r"/[^/]*$", "", self.__json_key['access_token_uri'])
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            logger.info(Message.KEYFILE_INFO.value, self.__files.key)
+        # read the json key file (the UTF-8 bytes are decoded by the parser)
+        # and keep the authentication request only
+        self.__auth = Auth.set_json_key(
+            json_loads(self.__files.key.read_bytes()))
+        # get base url: remove the last part of the url
+        self.__urls = Urls.set_base_url(
+            self.__auth.uri.rsplit('/', 1)[0], self.__options)
         # log the base url
-        logger.info(Message.BASE_URL.value, self.__base_url)
+        if log_info:
+            logger.info(Message.BASE_URL.value, self.__urls.base)
+
+    def __set_token(self, token: str) -> None:
+        """Set the token and the headers (session headers are static)."""
+        self.__token = token
+        # a new dict is built (not updated) for the requests in progress
+        self.__headers = {'Authorization': f"Bearer {token}"} if token \
+            else {}
+
+    def __post(self, url: str, data: bytes, timeout: int) \
+            -> Union[requests.Response, httpx.Response]:
+        """Post a JSON document with the current session."""
+        # same error with requests and httpx (requests would reopen the pool)
+        if self.__closed:
+            raise RuntimeError(Message.CLIENT_CLOSED.value)
+        if self.__options.http2:
+            # httpx: the raw body is passed with content=
+            return cast('httpx.Client', self.__session).post(
+                url, content=data, headers=self.__headers,
+                timeout=timeout)
+        # requests: verify/proxies are passed by request, otherwise the
+        # environment (trust_env) overrides the session attributes
+        # (pylint infers the httpx.Client type through cast())
+        # pylint: disable-next=unexpected-keyword-arg
+        return cast('requests.Session', self.__session).post(
+            url, data=data, headers=self.__headers, timeout=timeout,
+            verify=self.__options.verify, proxies=self.__options.proxies)
 
-    @check_exception
-    def __get_headers(self) -> dict[str, str]:
-        """Get the current header."""
-        return {'Content-Type': 'application/json',
-                'Accept': 'application/json',
-                'Authorization': f"Bearer {self.__token}"} if self.__token \
-            else {'Content-Type': 'application/json',
-                  'Accept': 'application/json'}
-
-    @check_exception
     def __read_token_file(self) -> bool:
         """Read the current token file and manage the token lifespan."""
-        if not self.__files.token.exists():
+        # one stat() call: existence + timestamp
+        try:
+            timestamp = self.__files.token.stat().st_mtime
+        except FileNotFoundError:
             return False
-        # log the token filename and read it.
-        logger.info(Message.TOKEN_FOUND.value, self.__files.token)
-        self.__token = str. strip(
-            self.__files.token.read_text(Constants.ENCODING.value))
-        # get the timestamp
-        timestamp = os.path.getmtime(self.__files.token)
-        token_timestamp = datetime.datetime.fromtimestamp(timestamp)
-        logger.info(Message.TOKEN_TIMESTAMP.value, token_timestamp)
+        # read the token file (bytes: no text I/O wrapper for a short token)
+        self.__set_token(
+            self.__files.token.read_bytes().strip().decode(_ENCODING))
+        # the logging level is checked once (the datetime is only used to
+        # log the timestamp)
+        log_info = logger.isEnabledFor(logging.INFO)
+        if log_info:
+            import datetime  # pylint: disable=import-outside-toplevel
+            logger.info(Message.TOKEN_FOUND.value, self.__files.token)
+            logger.info(Message.TOKEN_TIMESTAMP.value,
+                        datetime.datetime.fromtimestamp(timestamp))
         # if the token lifecycle is managed by this instance and the token
         # is too old then delete it and return False
         if (self.__options.manage_token
-                and token_timestamp < datetime.datetime.today() -
-                datetime.timedelta(hours=Constants.TOKEN_LIFESPAN.value)):
-            logger.info(Message.TOKEN_OLD.value)
+                and time.time() - timestamp > _TOKEN_LIFESPAN_SEC):
+            if log_info:
+                logger.info(Message.TOKEN_OLD.value)
             self.__close_session()
             return False
-        if self.__options.manage_token:
-            # keep the token according to the timestamp:
-            logger.info(Message.TOKEN_KEEP.value)
-        else:
-            # keep the token - manage_token=False
-            logger.info(Message.TOKEN_KEEP_OPT.value)
+        if log_info:
+            # keep the token according to the timestamp or manage_token=False
+            logger.info(Message.TOKEN_KEEP.value if self.__options.manage_token
+                        else Message.TOKEN_KEEP_OPT.value)
         return True
 
     @check_exception
     def __delete_token(self) -> None:
         """Close the current GraphQL session."""
-        response = requests.delete(
-            f"{self.__base_url}/{self.__options.session}",
-            headers=self.__get_headers(),
-            verify=self.__options.verify,
-            proxies=self.__options.proxies,
-            timeout=Constants.TIMEOUT.value)
+        response: Union[requests.Response, httpx.Response]
+        if self.__closed:
+            raise RuntimeError(Message.CLIENT_CLOSED.value)
+        if self.__options.http2:
+            response = cast('httpx.Client', self.__session).delete(
+                self.__urls.session,
+                headers=self.__headers,
+                timeout=_TIMEOUT)
+        else:
+            # pylint: disable-next=unexpected-keyword-arg
+            response = cast('requests.Session', self.__session).delete(
+                self.__urls.session,
+                headers=self.__headers,
+                timeout=_TIMEOUT,
+                verify=self.__options.verify,
+                proxies=self.__options.proxies)
         response.raise_for_status()
         # clear current token in memory
-        self.__token = ""
+        self.__set_token("")
 
     @check_exception
     def __get_access_token_keyfile(self) -> None:
         """Generate an access token using key file."""
-        session_url = self.__json_key['access_token_uri']
-        payload = {
-            "client_id": self.__json_key['client_id'],
-            "client_secret": self.__json_key['client_secret'],
-            "name": self.__json_key['name']}
-
-        response = requests.post(
-            session_url,
-            json=payload,
-            headers=self.__get_headers(),
-            verify=self.__options.verify,
-            proxies=self.__options.proxies,
-            timeout=Constants.TIMEOUT.value)
+        auth = cast(Auth, self.__auth)
+        response = self.__post(auth.uri, auth.payload, _TIMEOUT)
 
         response.raise_for_status()
 
-        response_json = response.json()
-        self.__token = response_json['access_token']
+        response_json = json_loads(response.content)
+        self.__set_token(response_json['access_token'])
 
         if self.__options.keep_token:
-            logger.info(Message.TOKEN_WRITE.value)
-            self.__files.token.write_text(
-                self.__token,
-                encoding=Constants.ENCODING.value)
+            self.__write_token_file()
         else:
             logger.info(Message.TOKEN_DONT_KEEP.value)
 
-    @check_exception
+    def __write_token_file(self) -> None:
+        """Write the token file if the token has changed."""
+        token = self.__token.encode(_ENCODING)
+        try:
+            if self.__files.token.read_bytes().strip() == token:
+                # the timestamp of the file is the token timestamp
+                logger.info(Message.TOKEN_SAME.value)
+                os.utime(self.__files.token)
+                return
+        except FileNotFoundError:
+            pass
+        logger.info(Message.TOKEN_WRITE.value)
+        # write a temporary file and replace the token file (atomic): the
+        # token file can be read by other scripts at the same time.
+        # mkstemp(): unique name by writer (process/thread), mode 0600
+        tmp_fd, tmp_name = tempfile.mkstemp(
+            prefix=f".{self.__files.token.name}.",
+            dir=self.__files.token.parent)
+        try:
+            with os.fdopen(tmp_fd, 'wb') as tmp_file:
+                tmp_file.write(token)
+            os.replace(tmp_name, self.__files.token)
+        except OSError:
+            # don't leave the temporary file
+            os.unlink(tmp_name)
+            raise
+
     def __manage_session(self) -> None:
         """Manage the GraphQL session."""
         # get info from the json keyfile
@@ -329,10 +623,11 @@ class GraphClient:
             and (not self.__options.keep_token
                  or not self.__read_token_file())):
             self.__get_access_token_keyfile()
-        # delete sensitive info in memory !
-        self.__json_key = {}
+        if not self.__options.manage_token:
+            # the token is not requested by this instance: delete sensitive
+            # info in memory ! (renew_token() reads the key file again)
+            self.__auth = None
 
-    @check_exception
     def __close_session(self) -> None:
         """Close the session and log errors."""
         try:
@@ -341,7 +636,6 @@ class GraphClient:
             logger.error(current_exception)
             logger.error(Message.TOKEN_BAD.value)
 
-    @check_exception
     def renew_token(self) -> None:
         """Renew the access token with the keyfile (force mode).
 
@@ -351,16 +645,22 @@ class GraphClient:
             None
         """
         logger.info(Message.TOKEN_RENEW.value)
-        self.__read_key_file()
+        # the key file is read again if the auth data were dropped
+        # (manage_token=False)
+        if self.__auth is None:
+            self.__read_key_file()
         self.__close_session()
-        self.__get_access_token_keyfile()
-        # delete sensitive info !
-        self.__json_key = {}
+        try:
+            self.__get_access_token_keyfile()
+        finally:
+            if not self.__options.manage_token:
+                # delete sensitive info in memory !
+                self.__auth = None
 
     @check_exception
     def query(self, my_query: str,
               my_variables: Optional[dict[str, Any]] = None,
-              timeout: int = Constants.TIMEOUT.value) -> dict[str, Any]:
+              timeout: int = _TIMEOUT) -> dict[str, Any]:
         """Perform a GraphQL request.
 
         Args:
@@ -371,20 +671,92 @@ class GraphClient:
         Return:
             dict[str, Any]: the response in json format.
         """
-        body: dict[str, Any] = {"query": f"{my_query}"}
-        if my_variables:
-            body['variables'] = my_variables
-
-        response = requests.post(
-            f"{self.__base_url}/{self.__options.graphql}",
-            headers=self.__get_headers(),
-            json=body,
-            verify=self.__options.verify,
-            proxies=self.__options.proxies,
-            timeout=timeout)
+        return json_loads(self.__query(my_query, my_variables, timeout))
+
+    @check_exception
+    def query_raw(self, my_query: str,
+                  my_variables: Optional[dict[str, Any]] = None,
+                  timeout: int = _TIMEOUT) -> bytes:
+        """Perform a GraphQL request and return the JSON document.
+
+        The response is not parsed: use it to store or forward the response.
+
+        Args:
+            my_query(str): query
+            my_variables(dict[str, Any]): variables to use during the query
+            timeout(int): timeout (default: Constants.TIMEOUT.value)
+
+        Return:
+            bytes: the response (JSON document).
+        """
+        return self.__query(my_query, my_variables, timeout)
+
+    def __query(self, my_query: str, my_variables: Optional[dict[str, Any]],
+                timeout: int) -> bytes:
+        """Post the query and return the response content."""
+        # the same query is often repeated (polling): the body without
+        # variables is cached
+        data = json_dumps({"query": my_query, "variables": my_variables}) \
+            if my_variables else json_dumps_query(my_query)
+
+        response = self.__post(self.__urls.query, data, timeout)
 
         response.raise_for_status()
-        return response.json()
+        return response.content
+
+    @check_exception
+    def query_batch(self,
+                    queries: list[tuple[str, Optional[dict[str, Any]]]],
+                    timeout: int = _TIMEOUT,
+                    max_batch: int = _MAX_BATCH) \
+            -> list[dict[str, Any]]:
+        """Perform several GraphQL requests with one HTTP request by batch.
+
+        The operations are sent as a JSON list (batch) therefore we have one
+        round-trip for max_batch queries. If the GraphQL API doesn't support
+        it (400, 404, 405, 415 or 422 status, or no list of results), the
+        queries are sent one by one. The other errors (401, 403, 5xx...) are
+        raised.
+
+        Args:
+            queries(list[tuple[str, Optional[dict[str, Any]]]]): list of
+                (query, variables)
+            timeout(int): timeout (default: Constants.TIMEOUT.value)
+            max_batch(int): queries by batch (default: 10)
+
+        Return:
+            list[dict[str, Any]]: the responses in json format (same order).
+        """
+        responses: list[dict[str, Any]] = []
+        batch = True
+        for start in range(0, len(queries), max_batch):
+            chunk = queries[start:start + max_batch]
+            if batch:
+                body: list[dict[str, Any]] = [
+                    {"query": my_query, "variables": my_variables}
+                    if my_variables else {"query": my_query}
+                    for my_query, my_variables in chunk]
+                response = self.__post(
+                    self.__urls.query, json_dumps(body), timeout)
+                # batch not supported: the next chunks are sent one by one.
+                # An auth error (401/403) is not a batch issue: raised below
+                batch = response.status_code not in _BATCH_UNSUPPORTED
+                if batch:
+                    response.raise_for_status()
+                    # one result by operation is expected, otherwise the
+                    # server has read the list as a single (bad) operation
+                    result = json_loads(response.content)
+                    batch = isinstance(result, list) \
+                        and len(result) == len(chunk)
+                    if batch:
+                        responses.extend(result)
+                        continue
+                logger.info(Message.BATCH_FALLBACK.value,
+                            response.status_code)
+            responses.extend(
+                json_loads(self.__query(my_query, my_variables, timeout))
+                for my_query, my_variables in chunk)
+        return responses
 
     def close_session(self) -> None:
         """Close the current session."""
@@ -394,3 +766,21 @@ class GraphClient:
         if not self.__options.keep_token:
             logger.info(Message.TOKEN_DEL.value)
             self.__close_session()
+
+    def close(self) -> None:
+        """Release the HTTP connections (the token is not deleted).
+
+        The client can't send requests after close().
+        """
+        self.__session.close()
+        self.__closed = True
+        # delete sensitive info in memory !
+        self.__auth = None
+
+    def __enter__(self) -> GraphClient:
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Exit the runtime context and release the HTTP connections."""
+        self.close()
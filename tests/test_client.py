@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""GraphClient tests (local HTTP server, no external access)."""
+from __future__ import annotations
+
+import json
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+from requests import HTTPError
+from requests.adapters import HTTPAdapter
+
+from graphqlclient import GraphClient
+
+
+class SendCalled(Exception):
+    """Stop the request after the send() arguments are captured."""
+
+
+class GraphServer(ThreadingHTTPServer):
+    """Local GraphQL API: answer the batches with the batch_reply."""
+
+    batch_reply: tuple[int, Any] = (200, None)
+    bodies: list[Any]
+
+
+class GraphHandler(BaseHTTPRequestHandler):
+    """Echo the operation name of each query ("query <name> {...}").
+
+    The token requests (key file) get the "token-1" access token.
+    """
+
+    server: GraphServer
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        """Answer a single query or a batch of queries."""
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        self.server.bodies.append(body)
+        if isinstance(body, list):
+            status, reply = self.server.batch_reply
+            if reply is None:
+                reply = [self.result(item) for item in body]
+        elif "client_id" in body:
+            status, reply = 200, {"access_token": "token-1"}
+        else:
+            status, reply = 200, self.result(body)
+        content = json.dumps(reply).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    @staticmethod
+    def result(body: dict[str, Any]) -> dict[str, Any]:
+        """Return the result of one query."""
+        return {"data": {"name": body["query"].split()[1]}}
+
+    def log_message(self, *args: Any) -> None:
+        """Keep the test output clean."""
+
+
+@pytest.fixture(name="server")
+def fixture_server() -> Iterator[GraphServer]:
+    """Run the local GraphQL API in a thread."""
+    server = GraphServer(("127.0.0.1", 0), GraphHandler)
+    server.bodies = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def new_client(server: GraphServer) -> GraphClient:
+    """Return an anonymous client of the local GraphQL API."""
+    return GraphClient(base_url=f"http://127.0.0.1:{server.server_port}",
+                       trust_env=False)
+
+
+QUERIES: list[tuple[str, Any]] = [
+    (f"query q{index} {{ ok }}", None) for index in range(5)]
+RESULTS: list[dict[str, Any]] = [
+    {"data": {"name": f"q{index}"}} for index in range(5)]
+
+
+def test_explicit_options_win_over_environment(
+        monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check insecure/proxies are not overridden by the environment."""
+    monkeypatch.setenv("REQUESTS_CA_BUNDLE", "/env/ca-bundle.pem")
+    monkeypatch.setenv("CURL_CA_BUNDLE", "/env/ca-bundle.pem")
+    monkeypatch.setenv("HTTPS_PROXY", "http://env-proxy:3128")
+    monkeypatch.delenv("NO_PROXY", raising=False)
+    monkeypatch.delenv("no_proxy", raising=False)
+    sent: dict[str, Any] = {}
+
+    def send(_self: HTTPAdapter, _request: Any, **kwargs: Any) -> None:
+        sent.update(kwargs)
+        raise SendCalled()
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
+    proxies = {"https": "http://explicit-proxy:3128"}
+    with GraphClient(base_url="https://graphql.example", insecure=True,
+                     proxies=proxies) as client:
+        with pytest.raises(SendCalled):
+            client.query("query { ok }")
+    assert sent["verify"] is False
+    assert sent["proxies"]["https"] == proxies["https"]
+
+
+def test_query_batch(server: GraphServer) -> None:
+    """Check the results of a batch are returned by max_batch chunks."""
+    with new_client(server) as client:
+        assert client.query_batch(QUERIES, max_batch=2) == RESULTS
+    assert [len(body) for body in server.bodies] == [2, 2, 1]
+
+
+def test_query_batch_4xx_fallback(server: GraphServer) -> None:
+    """Check the queries are sent one by one if the batch is refused."""
+    server.batch_reply = (400, {"errors": [{"message": "Must provide query"}]})
+    with new_client(server) as client:
+        assert client.query_batch(QUERIES, max_batch=2) == RESULTS
+    # one refused batch, then one request by query
+    assert isinstance(server.bodies[0], list)
+    assert len(server.bodies) == 1 + len(QUERIES)
+
+
+def test_query_batch_dict_fallback(server: GraphServer) -> None:
+    """Check the queries are sent one by one if no list is returned."""
+    server.batch_reply = (200, {"errors": [{"message": "Must provide query"}]})
+    with new_client(server) as client:
+        assert client.query_batch(QUERIES, max_batch=2) == RESULTS
+    assert len(server.bodies) == 1 + len(QUERIES)
+
+
+def test_query_batch_401_raised(server: GraphServer) -> None:
+    """Check an auth error is raised and not read as a batch issue."""
+    server.batch_reply = (401, {"errors": [{"message": "Unauthorized"}]})
+    with new_client(server) as client:
+        with pytest.raises(HTTPError):
+            client.query_batch(QUERIES, max_batch=2)
+    assert len(server.bodies) == 1
+
+
+@pytest.mark.parametrize("http2", [False, True])
+def test_closed_client(http2: bool) -> None:
+    """Check a closed client raises the same error with requests/httpx."""
+    if http2:
+        pytest.importorskip("httpx")
+    client = GraphClient(base_url="http://127.0.0.1:9", http2=http2)
+    client.close()
+    with pytest.raises(RuntimeError, match="client is closed"):
+        client.query("query { ok }")
+
+
+def test_token_file(server: GraphServer, tmp_path: Path) -> None:
+    """Check the token file is private and no temporary file is left."""
+    key_file = tmp_path / "key.json"
+    key_file.write_text(json.dumps({
+        "access_token_uri":
+            f"http://127.0.0.1:{server.server_port}/session/token",
+        "client_id": "id", "client_secret": "secret", "name": "name"}))
+    with GraphClient(str(key_file), trust_env=False):
+        pass
+    token_file = tmp_path / "key.token"
+    assert token_file.read_text() == "token-1"
+    assert stat.S_IMODE(token_file.stat().st_mode) == 0o600
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "key.json", "key.token"]